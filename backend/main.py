@@ -12,7 +12,7 @@ from pydantic import BaseModel
 import logging
 import time
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, List
 from contextlib import asynccontextmanager
 import os
 
@@ -986,6 +986,34 @@ async def create_savings_goal(request: dict):
 			}
 		)
 
+@app.post("/savings/goal/batch")
+async def create_savings_goals_batch(requests: List[Dict[str, Any]]):
+	"""Create several savings goals in a single round trip."""
+	results = []
+	for request in requests:
+		try:
+			user_id = request.get("user_id", "default_user")
+			goal_data = request.get("goal_data", {})
+			results.append(savings_planner.create_savings_goal(user_id, goal_data))
+		except Exception as e:
+			logger.error(f"Error creating savings goal in batch: {e}")
+			results.append({
+				"success": False,
+				"error": str(e),
+				"message": "Failed to create savings goal"
+			})
+
+	succeeded = sum(1 for result in results if result.get("success"))
+	return JSONResponse(
+		status_code=200 if succeeded or not results else 400,
+		content={
+			"success": succeeded == len(results),
+			"succeeded": succeeded,
+			"failed": len(results) - succeeded,
+			"results": results
+		}
+	)
+
 @app.post("/savings/entry")
 async def add_savings_entry(request: dict):
 	"""Add a savings entry and get AI feedback."""
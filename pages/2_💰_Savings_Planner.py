@@ -4,11 +4,23 @@ Savings Planner Page - AI-powered savings goal creation and tracking
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 from datetime import date
+from concurrent.futures import Future
+import queue
+import threading
 import time
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Configure page
 st.set_page_config(
     page_title="Savings Planner - Taxora",
@@ -16,23 +28,121 @@ st.set_page_config(
     layout="wide"
 )
 
+# Serialize Plotly figures with orjson (faster, and encodes typed arrays compactly)
+pio.json.config.default_engine = 'orjson'
+
 # Backend API configuration
 API_BASE_URL = "http://127.0.0.1:8000"
 
+# Seconds allowed per savings goal request (queue wait, and HTTP time per batched goal)
+GOAL_REQUEST_TIMEOUT = 30
+
+# Display labels for the saving method options
+SAVING_METHOD_LABELS = {
+    "bank_account": "🏦 Bank Savings Account",
+    "fixed_deposit": "🔒 Fixed Deposit",
+    "mutual_fund": "📈 Mutual Funds",
+    "stocks": "📊 Stock Market",
+    "mixed": "🔄 Mixed Portfolio"
+}
+
+# Streamlit message element used for each AI insight type
+INSIGHT_RENDERERS = {"info": st.info, "success": st.success, "warning": st.warning}
+
+@st.cache_data
+def _sample_goals_df():
+    """Sample goals for the progress tab, with derived progress columns."""
+    return pd.DataFrame([
+        {"name": "Emergency Fund", "target": 150000, "current": 150000, "monthly": 15000, "status": "Completed"},
+        {"name": "Vacation Fund", "target": 80000, "current": 60000, "monthly": 8000, "status": "In Progress"},
+        {"name": "House Down Payment", "target": 500000, "current": 225000, "monthly": 25000, "status": "In Progress"},
+        {"name": "New Car", "target": 300000, "current": 45000, "monthly": 12000, "status": "In Progress"}
+    ]).assign(
+        progress=lambda d: d.current/d.target,
+        remaining=lambda d: d.target-d.current,
+        months_left=lambda d: np.where((d.monthly>0) & (d.remaining>0), d.remaining/d.monthly, 0)
+    )
+
+@st.cache_resource
+def _session():
+    """Shared HTTP session with keep-alive connection pooling."""
+    s = requests.Session()
+    s.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.2)))
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.2)))
+    s.headers.update({"Connection": "keep-alive"})
+    return s
+
+class BatchClient:
+    """Coalesces requests submitted within a short window into a single batch POST."""
+
+    def __init__(self, session, url, interval=0.01, max_batch_size=10):
+        self.session = session
+        self.url = url
+        self.interval = interval
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, payload):
+        """Queue a payload and return a Future resolved with its response item.
+
+        A Future cancelled before its batch is sent is dropped from the batch.
+        """
+        future = Future()
+        self._queue.put((payload, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Skip items whose callers gave up while queued
+            batch = [(payload, future) for payload, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                response = self.session.post(
+                    self.url,
+                    json=[payload for payload, _ in batch],
+                    timeout=GOAL_REQUEST_TIMEOUT * len(batch)
+                )
+                results = response.json().get('results', [])
+            except Exception:
+                results = []
+            for i, (_, future) in enumerate(batch):
+                future.set_result(results[i] if i < len(results) else None)
+
+@st.cache_resource
+def _goal_batch_client():
+    """Shared batch client for savings goal creation."""
+    return BatchClient(_session(), f"{API_BASE_URL}/savings/goal/batch")
+
 def create_savings_goal(goal_data):
-    """Create a new savings goal."""
-    try:
-        response = requests.post(
-            f"{API_BASE_URL}/savings/goal",
-            json=goal_data,
-            timeout=30
-        )
-        if response.status_code == 200:
-            return response.json()
-        return None
-    except:
-        return None
+    """Queue a new savings goal; returns a Future resolved with the backend response."""
+    return _goal_batch_client().submit(goal_data)
+
+def _project(months_to_target, monthly_saving):
+    """Month indices and cumulative savings for each month up to the target."""
+    months = np.arange(months_to_target + 1).astype(np.int32)
+    return months, (monthly_saving * months).astype(np.float64)
 
+@st.cache_resource
+def _projection_kernel():
+    """Projection kernel, JIT-compiled once per process when numba is installed (optional)."""
+    return njit(cache=True)(_project) if njit is not None else _project
+
+@st.cache_data(max_entries=128, show_spinner=False)
 def calculate_savings_projection(target_amount, monthly_saving, start_date, target_date):
     """Calculate savings projection and timeline."""
     months_to_target = (target_date.year - start_date.year) * 12 + (target_date.month - start_date.month)
@@ -44,16 +154,12 @@ def calculate_savings_projection(target_amount, monthly_saving, start_date, targ
     shortfall = max(0, target_amount - total_saved)
     required_monthly = target_amount / months_to_target if months_to_target > 0 else 0
     
-    # Generate monthly projection
-    projection = []
-    current_amount = 0
-    for month in range(months_to_target + 1):
-        projection.append({
-            'month': month,
-            'amount': current_amount,
-            'target_line': (target_amount / months_to_target) * month if months_to_target > 0 else 0
-        })
-        current_amount += monthly_saving
+    # Generate monthly projection as column arrays
+    months, amount = _projection_kernel()(months_to_target, monthly_saving)
+    projection = {
+        'month': months,
+        'amount': amount
+    }
     
     return {
         'months_to_target': months_to_target,
@@ -64,20 +170,102 @@ def calculate_savings_projection(target_amount, monthly_saving, start_date, targ
         'success_rate': min(100, (total_saved / target_amount) * 100) if target_amount > 0 else 0
     }
 
+@st.cache_resource
+def _projection_template():
+    """Shared layout template for the projection chart."""
+    return go.layout.Template(layout=dict(hovermode='x unified', xaxis_title="Months", yaxis_title="Amount (₹)"))
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def build_projection_chart(target_amount, monthly_saving, start_date, target_date):
+    """Build the savings projection chart, cached per set of inputs."""
+    projection = calculate_savings_projection(target_amount, monthly_saving, start_date, target_date)
+    months = projection['projection']['month']
+    amount = projection['projection']['amount']
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=months, y=amount, mode='lines+markers', name='Your Savings'))
+    fig.add_trace(go.Scattergl(x=[0, projection['months_to_target']], y=[target_amount, target_amount], mode='lines', name='Target Amount', line=dict(dash='dash')))
+    fig.update_layout(template=_projection_template(), title="Savings Projection Over Time")
+    return fig
+
+@st.fragment
+def render_projection_panel():
+    """Render the goal target inputs with a live savings projection.
+
+    Runs as a fragment so editing these inputs reruns only this panel. The
+    values are read back from session state by the goal form on submit.
+    """
+    st.subheader("🎯 Goal Target")
+    col1, col2, col3 = st.columns(3)
+    target_amount = col1.number_input("Target Amount (₹):", min_value=1000, value=100000, step=1000, key="goal_target_amount")
+    monthly_saving = col2.number_input("Monthly Saving Target (₹):", min_value=500, value=10000, step=500, key="goal_monthly_saving")
+    target_date = col3.date_input(
+        "Target Date:",
+        value=date.today(),
+        min_value=date.today(),
+        max_value=date(2035, 12, 31),
+        key="goal_target_date"
+    )
+
+    projection = calculate_savings_projection(target_amount, monthly_saving, date.today(), target_date)
+    if projection:
+        st.subheader("📊 Savings Projection")
+        shortfall = projection['shortfall']
+        summary = pd.DataFrame([{
+            "⏱️ Months to Goal": projection['months_to_target'],
+            "💰 Total Saved": projection['total_saved'],
+            "🎯 Success Rate": projection['success_rate'],
+            "Status": "⚠️ Shortfall" if shortfall > 0 else "✅ Surplus",
+            "Shortfall / Surplus": shortfall if shortfall > 0 else projection['total_saved'] - target_amount
+        }])
+        st.dataframe(
+            summary.style.format({
+                "💰 Total Saved": "₹{:,}",
+                "🎯 Success Rate": "{:.1f}%",
+                "Shortfall / Surplus": "₹{:,}"
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+        
+        # Chart
+        fig = build_projection_chart(target_amount, monthly_saving, date.today(), target_date)
+        st.plotly_chart(fig, use_container_width=True, key="proj_chart")
+
+@st.fragment(run_every=0.5)
+def render_goal_status():
+    """Poll the pending goal request, rerunning only this block until it finishes."""
+    pending = st.session_state['pending_goal']
+    # Give up on goals still queued past the deadline; once sent, wait for the response
+    if not pending.done() and time.monotonic() > st.session_state['pending_goal_deadline']:
+        pending.cancel()
+    if pending.done():
+        result = None if pending.cancelled() else pending.result()
+        del st.session_state['pending_goal']
+        del st.session_state['pending_goal_deadline']
+        st.session_state['goal_created'] = bool(result and result.get('success'))
+        # Full rerun shows the outcome and stops this fragment from polling
+        st.rerun(scope="app")
+    else:
+        st.info("🤖 AI is analyzing your goal...")
+
+def render_sidebar():
+    """Render the static savings overview sidebar."""
+    st.header("📊 Savings Overview")
+    st.metric("💰 Total Savings", "₹1,25,000", "↗️ +15,000")
+    st.metric("🎯 Active Goals", "3", "↗️ +1")
+    st.metric("📈 Monthly Growth", "12.5%", "↗️ +2.1%")
+    st.markdown("### 🏆 Recent Achievements")
+    st.success("✅ Emergency Fund - Completed!")
+    st.info("🎯 Vacation Fund - 75% complete")
+    st.warning("⏰ House Down Payment - 45% complete")
+
 def main():
     st.title("💰 AI-Powered Savings Planner")
     st.markdown("Create smart savings goals with AI-driven insights and recommendations")
     
     # Sidebar
     with st.sidebar:
-        st.header("📊 Savings Overview")
-        st.metric("💰 Total Savings", "₹1,25,000", "↗️ +15,000")
-        st.metric("🎯 Active Goals", "3", "↗️ +1")
-        st.metric("📈 Monthly Growth", "12.5%", "↗️ +2.1%")
-        st.markdown("### 🏆 Recent Achievements")
-        st.success("✅ Emergency Fund - Completed!")
-        st.info("🎯 Vacation Fund - 75% complete")
-        st.warning("⏰ House Down Payment - 45% complete")
+        render_sidebar()
 
     tab1, tab2, tab3 = st.tabs(["🎯 Create Goal", "📊 Track Progress", "🤖 AI Insights"])
 
@@ -85,55 +273,28 @@ def main():
     with tab1:
         st.header("🎯 Create New Savings Goal")
         
+        # Target inputs and projection preview (reruns on its own as inputs change)
+        render_projection_panel()
+        target_amount = st.session_state['goal_target_amount']
+        monthly_saving_target = st.session_state['goal_monthly_saving']
+        target_date = st.session_state['goal_target_date']
+
         with st.form("savings_goal_form"):
             col1, col2 = st.columns(2)
             with col1:
                 st.subheader("📝 Goal Details")
                 goal_name = st.text_input("Goal Name:", placeholder="e.g., Emergency Fund, Vacation, New Car")
-                target_amount = st.number_input("Target Amount (₹):", min_value=1000, value=100000, step=1000)
-                target_date = st.date_input(
-                    "Target Date:",
-                    value=date.today(),
-                    min_value=date.today(),
-                    max_value=date(2035, 12, 31)
-                )
                 description = st.text_area("Description:", placeholder="Describe your savings goal")
             with col2:
                 st.subheader("💼 Financial Details")
                 monthly_salary = st.number_input("Monthly Salary (₹):", min_value=1000, value=50000, step=1000)
-                monthly_saving_target = st.number_input("Monthly Saving Target (₹):", min_value=500, value=10000, step=500)
                 saving_method = st.selectbox(
                     "Preferred Saving Method:",
-                    ["bank_account", "fixed_deposit", "mutual_fund", "stocks", "mixed"],
-                    format_func=lambda x: {
-                        "bank_account": "🏦 Bank Savings Account",
-                        "fixed_deposit": "🔒 Fixed Deposit",
-                        "mutual_fund": "📈 Mutual Funds",
-                        "stocks": "📊 Stock Market",
-                        "mixed": "🔄 Mixed Portfolio"
-                    }[x]
+                    list(SAVING_METHOD_LABELS),
+                    format_func=SAVING_METHOD_LABELS.__getitem__
                 )
                 risk_tolerance = st.select_slider("Risk Tolerance:", options=["Low", "Medium", "High"], value="Medium")
 
-            # Calculate projection
-            if target_amount > 0 and monthly_saving_target > 0:
-                projection = calculate_savings_projection(target_amount, monthly_saving_target, date.today(), target_date)
-                if projection:
-                    st.subheader("📊 Savings Projection")
-                    col1, col2, col3, col4 = st.columns(4)
-                    col1.metric("⏱️ Months to Goal", f"{projection['months_to_target']}")
-                    col2.metric("💰 Total Saved", f"₹{projection['total_saved']:,}")
-                    col3.metric("🎯 Success Rate", f"{projection['success_rate']:.1f}%")
-                    col4.metric("⚠️ Shortfall" if projection['shortfall'] > 0 else "✅ Surplus", f"₹{projection['shortfall']:,}")
-                    
-                    # Chart
-                    df = pd.DataFrame(projection['projection'])
-                    fig = go.Figure()
-                    fig.add_trace(go.Scatter(x=df['month'], y=df['amount'], mode='lines+markers', name='Your Savings'))
-                    fig.add_trace(go.Scatter(x=df['month'], y=[target_amount]*len(df), mode='lines', name='Target Amount', line=dict(dash='dash')))
-                    fig.update_layout(title="Savings Projection Over Time", xaxis_title="Months", yaxis_title="Amount (₹)", hovermode='x unified')
-                    st.plotly_chart(fig, use_container_width=True)
-
             # Submit button
             if st.form_submit_button("🚀 Create Goal with AI Analysis"):
                 if not goal_name.strip():
@@ -152,34 +313,42 @@ def main():
                             "risk_tolerance": risk_tolerance
                         }
                     }
-                    with st.spinner("🤖 AI is analyzing your goal..."):
-                        result = create_savings_goal(goal_data)
-                        if result and result.get('success'):
-                            st.success("✅ Savings goal created successfully!")
-                        else:
-                            st.error("❌ Failed to create savings goal. Check backend connection.")
+                    st.session_state['pending_goal'] = create_savings_goal(goal_data)
+                    st.session_state['pending_goal_deadline'] = time.monotonic() + GOAL_REQUEST_TIMEOUT
+
+        # Goal creation status (polled by its own fragment while the request runs)
+        if 'pending_goal' in st.session_state:
+            render_goal_status()
+        elif 'goal_created' in st.session_state:
+            if st.session_state.pop('goal_created'):
+                st.success("✅ Savings goal created successfully!")
+            else:
+                st.error("❌ Failed to create savings goal. Check backend connection.")
 
     # ===== TRACK PROGRESS TAB =====
     with tab2:
         st.header("📊 Track Your Progress")
-        sample_goals = [
-            {"name": "Emergency Fund", "target": 150000, "current": 150000, "monthly": 15000, "status": "Completed"},
-            {"name": "Vacation Fund", "target": 80000, "current": 60000, "monthly": 8000, "status": "In Progress"},
-            {"name": "House Down Payment", "target": 500000, "current": 225000, "monthly": 25000, "status": "In Progress"},
-            {"name": "New Car", "target": 300000, "current": 45000, "monthly": 12000, "status": "In Progress"}
-        ]
-        for goal in sample_goals:
-            col1, col2, col3 = st.columns([2,1,1])
-            progress = goal["current"]/goal["target"]
-            col1.subheader(f"🎯 {goal['name']}")
-            col1.progress(progress)
-            col1.caption(f"₹{goal['current']:,} / ₹{goal['target']:,} ({progress*100:.1f}%)")
-            remaining = goal['target']-goal['current']
-            months_left = remaining/goal['monthly'] if goal['monthly']>0 and remaining>0 else 0
-            col2.metric("Monthly Saving", f"₹{goal['monthly']:,}")
-            col2.caption(f"~{months_left:.1f} months left" if months_left>0 else "Goal achieved!")
-            col3.success("✅ Completed") if goal['status']=="Completed" else col3.info("🔄 In Progress")
-            st.divider()
+        st.dataframe(
+            _sample_goals_df().style.format({
+                "target": "₹{:,}",
+                "current": "₹{:,}",
+                "remaining": "₹{:,}",
+                "monthly": "₹{:,}",
+                "months_left": "{:.1f}"
+            }),
+            column_config={
+                "name": st.column_config.TextColumn("🎯 Goal"),
+                "target": st.column_config.NumberColumn("Target"),
+                "current": st.column_config.NumberColumn("Saved"),
+                "remaining": st.column_config.NumberColumn("Remaining"),
+                "monthly": st.column_config.NumberColumn("Monthly Saving"),
+                "status": st.column_config.TextColumn("Status"),
+                "progress": st.column_config.ProgressColumn("Progress", min_value=0, max_value=1),
+                "months_left": st.column_config.NumberColumn("Months Left")
+            },
+            hide_index=True,
+            use_container_width=True
+        )
 
     # ===== AI INSIGHTS TAB =====
     with tab3:
@@ -190,9 +359,7 @@ def main():
             {"title":"⚠️ Goal Timeline Alert","content":"House down payment may need adjustment","type":"warning"},
         ]
         for insight in insights:
-            st.info(insight['content']) if insight['type']=="info" else None
-            st.success(insight['content']) if insight['type']=="success" else None
-            st.warning(insight['content']) if insight['type']=="warning" else None
+            INSIGHT_RENDERERS[insight['type']](insight['content'])
 
 if __name__=="__main__":
     main()